@@ -0,0 +1,100 @@
+import os
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from generate_solomon import generate_file
+from solve_solomon_100 import read_solomon_100, build_dist_matrix, build_model_100
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# --- ĐO KHẢ NĂNG MỞ RỘNG THEO KÍCH THƯỚC BÀI TOÁN ---
+# Mỗi kích thước chạy trong một tiến trình riêng để số đo bộ nhớ không bị cộng dồn.
+FOLDER = "solomon-synthetic"
+SIZES = [25, 50, 100, 200, 500, 1000, 2000, 5000]
+INSTANCE_CLASS = "RC1"
+SEED = 1
+MAX_MODEL_SIZE = 500   # Mô hình MTZ có n^2 biến nhị phân, lớn hơn mức này chỉ đo đọc file + ma trận
+MAX_SOLVE_SIZE = 100   # Chỉ gọi CBC cho các bài toán nhỏ
+TIME_LIMIT = 120       # Giới hạn thời gian giải (giây)
+
+
+def measure_size(n_customers):
+    path = generate_file(FOLDER, n_customers, INSTANCE_CLASS, SEED)
+    row = {'n': n_customers, 'parse': None, 'matrix': None, 'build': None,
+           'cols': None, 'rows': None, 'nz': None, 'solve': None, 'dist': None, 'mem_mb': None}
+
+    # Không có module resource thì dùng tracemalloc (chỉ đếm bộ nhớ phía Python, chạy chậm hơn)
+    if resource is None:
+        tracemalloc.start()
+
+    start = time.perf_counter()
+    data, cap = read_solomon_100(path, n_customers=n_customers)
+    row['parse'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    dist = build_dist_matrix(data)
+    row['matrix'] = time.perf_counter() - start
+
+    if n_customers <= MAX_MODEL_SIZE:
+        start = time.perf_counter()
+        model, _, _ = build_model_100(data, cap, dist)
+        row['build'] = time.perf_counter() - start
+        row['cols'], row['rows'], row['nz'] = model.num_cols, model.num_rows, model.num_nz
+
+        # Chỉ đo thời gian optimize() trên chính mô hình vừa dựng
+        if n_customers <= MAX_SOLVE_SIZE:
+            start = time.perf_counter()
+            model.optimize(max_seconds=TIME_LIMIT)
+            row['solve'] = time.perf_counter() - start
+            if model.num_solutions:
+                row['dist'] = model.objective_value
+        del model
+
+    if resource is None:
+        row['mem_mb'] = tracemalloc.get_traced_memory()[1] / 2**20
+        tracemalloc.stop()
+    else:
+        # ru_maxrss tính bằng byte trên macOS, KB trên Linux
+        scale = 1 if sys.platform == 'darwin' else 1024
+        row['mem_mb'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale / 2**20
+    return row
+
+
+def format_table(rows):
+    def fmt(v, spec):
+        width = int(spec.split('.')[0].rstrip('d'))
+        return '-'.rjust(width) if v is None else format(v, spec)
+
+    lines = [f"{'n':>6} {'parse(s)':>9} {'matrix(s)':>10} {'build(s)':>9} {'cols':>10} {'rows':>10} "
+             f"{'nonzeros':>11} {'solve(s)':>9} {'distance':>10} {'mem(MB)':>9}"]
+    for r in rows:
+        lines.append(f"{r['n']:>6} {fmt(r['parse'], '9.3f')} {fmt(r['matrix'], '10.3f')} {fmt(r['build'], '9.3f')} "
+                     f"{fmt(r['cols'], '10d')} {fmt(r['rows'], '10d')} {fmt(r['nz'], '11d')} "
+                     f"{fmt(r['solve'], '9.2f')} {fmt(r['dist'], '10.2f')} {fmt(r['mem_mb'], '9.1f')}")
+    return '\n'.join(lines)
+
+
+# --- CHƯƠNG TRÌNH CHÍNH ---
+if __name__ == "__main__":
+    rows = []
+    for n_customers in SIZES:
+        print(f"--- Đang đo kích thước {n_customers} khách hàng ({INSTANCE_CLASS}, seed {SEED}) ---")
+        with ProcessPoolExecutor(max_workers=1) as ex:
+            rows.append(ex.submit(measure_size, n_customers).result())
+
+    table = format_table(rows)
+    print(table)
+
+    if not os.path.exists('results'):
+        os.makedirs('results')
+    report_path = 'results/scaling_report.txt'
+    with open(report_path, 'w', encoding='utf-8') as f:
+        f.write(f"=== ĐO KHẢ NĂNG MỞ RỘNG VRPTW ===\n")
+        f.write(f"Lớp dữ liệu: {INSTANCE_CLASS}, seed: {SEED}, giới hạn giải: {TIME_LIMIT} giây\n")
+        f.write("-" * 40 + "\n")
+        f.write(table + "\n")
+    print(f"-> Đã ghi kết quả ra file: {report_path}")
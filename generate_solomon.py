@@ -0,0 +1,103 @@
+import os
+import math
+import random
+
+# --- SINH DỮ LIỆU KIỂU SOLOMON VỚI KÍCH THƯỚC TÙY Ý ---
+# Lớp R: khách hàng phân bố ngẫu nhiên, C: theo cụm, RC: trộn cả hai.
+# Loại 1: khung thời gian hẹp, horizon ngắn, xe nhỏ; loại 2: khung rộng, horizon dài, xe lớn.
+# Thông số (capacity, horizon, service) lấy theo bộ Solomon gốc.
+CLASS_PARAMS = {
+    'R1':  {'capacity': 200,  'horizon': 230,  'service': 10, 'width': (5, 30)},
+    'R2':  {'capacity': 1000, 'horizon': 1000, 'service': 10, 'width': (50, 250)},
+    'C1':  {'capacity': 200,  'horizon': 1236, 'service': 90, 'width': (30, 90)},
+    'C2':  {'capacity': 700,  'horizon': 3390, 'service': 90, 'width': (80, 320)},
+    'RC1': {'capacity': 200,  'horizon': 240,  'service': 10, 'width': (5, 30)},
+    'RC2': {'capacity': 1000, 'horizon': 960,  'service': 10, 'width': (50, 250)},
+}
+
+def _random_points(rng, n):
+    return [(rng.uniform(0, 100), rng.uniform(0, 100)) for _ in range(n)]
+
+def _clustered_points(rng, n, customers_per_cluster=10):
+    n_clusters = max(1, n // customers_per_cluster)
+    centers = [(rng.uniform(10, 90), rng.uniform(10, 90)) for _ in range(n_clusters)]
+    points = []
+    for k in range(n):
+        cx, cy = centers[k % n_clusters]
+        x = min(100, max(0, rng.gauss(cx, 4)))
+        y = min(100, max(0, rng.gauss(cy, 4)))
+        points.append((x, y))
+    return points
+
+def generate_instance(n_customers, instance_class='R1', seed=0):
+    """
+    Sinh một bài toán dạng Solomon (depot ở tâm, tọa độ trong [0, 100]).
+    Cùng n_customers, instance_class và seed luôn cho cùng một bộ dữ liệu.
+    """
+    params = CLASS_PARAMS[instance_class]
+    rng = random.Random(f"{instance_class}-{n_customers}-{seed}")
+    horizon = params['horizon']
+    service = params['service']
+
+    if instance_class.startswith('RC'):
+        n_clustered = n_customers // 2
+        points = _clustered_points(rng, n_clustered) + _random_points(rng, n_customers - n_clustered)
+        rng.shuffle(points)
+    elif instance_class.startswith('C'):
+        points = _clustered_points(rng, n_customers)
+    else:
+        points = _random_points(rng, n_customers)
+
+    depot = (50, 50)
+    data = [{'id': 0, 'x': depot[0], 'y': depot[1], 'demand': 0,
+             'ready': 0, 'due': horizon, 'service': 0}]
+    for i, (x, y) in enumerate(points, start=1):
+        x, y = round(x), round(y)
+        d0 = math.sqrt((x - depot[0])**2 + (y - depot[1])**2)
+        # Tâm khung thời gian nằm trong khoảng mà xe còn kịp đến và quay về depot
+        earliest = math.ceil(d0)
+        latest = max(earliest, math.floor(horizon - d0 - service))
+        center = rng.uniform(earliest, latest)
+        half = rng.uniform(*params['width']) / 2
+        ready = max(earliest, int(center - half))
+        due = min(latest, int(center + half))
+        if due < ready:
+            due = ready
+        data.append({'id': i, 'x': x, 'y': y, 'demand': rng.randint(1, 40),
+                     'ready': ready, 'due': due, 'service': service})
+    return data, params['capacity']
+
+def write_solomon(file_path, name, data, capacity, n_vehicles=None):
+    if n_vehicles is None:
+        n_vehicles = max(25, (len(data) - 1) // 4)
+    with open(file_path, 'w') as f:
+        f.write(f"{name}\n\n")
+        f.write("VEHICLE\n")
+        f.write("NUMBER     CAPACITY\n")
+        f.write(f"  {n_vehicles:<10} {capacity}\n\n")
+        f.write("CUSTOMER\n")
+        f.write("CUST NO.  XCOORD.   YCOORD.    DEMAND   READY TIME  DUE DATE   SERVICE   TIME\n")
+        f.write(" \n")
+        for d in data:
+            f.write(f"{d['id']:5d} {d['x']:8d} {d['y']:10d} {d['demand']:10d} {d['ready']:10d} {d['due']:10d} {d['service']:10d}   \n")
+
+def generate_file(folder, n_customers, instance_class='R1', seed=0):
+    """Sinh và ghi file (nếu chưa có), trả về đường dẫn file."""
+    if not os.path.exists(folder):
+        os.makedirs(folder)
+    name = f"{instance_class}_{n_customers}_s{seed}"
+    file_path = os.path.join(folder, name + ".txt")
+    if not os.path.exists(file_path):
+        data, capacity = generate_instance(n_customers, instance_class, seed)
+        write_solomon(file_path, name, data, capacity)
+    return file_path
+
+if __name__ == "__main__":
+    FOLDER = "solomon-synthetic"
+    SIZES = [500, 1000, 2000, 5000]
+    SEED = 1
+
+    for n_customers in SIZES:
+        for instance_class in CLASS_PARAMS:
+            path = generate_file(FOLDER, n_customers, instance_class, SEED)
+            print(f"Đã sinh: {path}")
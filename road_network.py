@@ -0,0 +1,322 @@
+import os
+import math
+import heapq
+import pickle
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+
+# --- MA TRẬN THỜI GIAN DI CHUYỂN TRÊN MẠNG ĐƯỜNG (OFFLINE) ---
+# Định dạng file đồ thị (ví dụ trích xuất từ OSM rồi chuyển sang danh sách cạnh):
+#   v <id> <x> <y>                 # nút giao, cùng hệ tọa độ với file Solomon
+#   a <u> <v> <travel_time>        # cung một chiều u -> v
+#   e <u> <v> <travel_time>        # cạnh hai chiều
+# Dòng trống và dòng bắt đầu bằng '#' được bỏ qua.
+#
+# Ma trận được tính bằng Contraction Hierarchies (CH) + thuật toán bucket:
+# tiền xử lý CH một lần cho mỗi file đồ thị (lưu cache), sau đó mỗi truy vấn
+# chỉ duyệt "lên dốc" trong CH nên không gian tìm kiếm rất nhỏ so với Dijkstra thường.
+
+_FWD = None      # Đồ thị lên dốc chiều xuôi, dùng chung trong các tiến trình con
+_BUCKETS = None  # Bucket của tìm kiếm ngược, dùng chung trong các tiến trình con
+
+
+# --- 1. HÀM ĐỌC ĐỒ THỊ ---
+def read_road_graph(file_path):
+    if not os.path.exists(file_path):
+        return None, None
+    coords = {}
+    adj = {}
+    with open(file_path, 'r') as f:
+        for line in f:
+            p = line.strip().split()
+            if not p or p[0].startswith('#'):
+                continue
+            if p[0] == 'v' and len(p) >= 4:
+                coords[int(p[1])] = (float(p[2]), float(p[3]))
+                adj.setdefault(int(p[1]), [])
+            elif p[0] in ('a', 'e') and len(p) >= 4:
+                u, v, w = int(p[1]), int(p[2]), float(p[3])
+                adj.setdefault(u, []).append((v, w))
+                adj.setdefault(v, [])
+                if p[0] == 'e':
+                    adj[v].append((u, w))
+    return coords, adj
+
+
+# --- 2. GẮN KHÁCH HÀNG VÀO NÚT GẦN NHẤT ---
+def default_cell_size(coords):
+    # Trung bình khoảng một nút mỗi ô, không phụ thuộc đơn vị tọa độ (độ, mét, ...)
+    if not coords:
+        return 1.0
+    xs = [x for x, _ in coords.values()]
+    ys = [y for _, y in coords.values()]
+    area = max(max(xs) - min(xs), 1e-9) * max(max(ys) - min(ys), 1e-9)
+    return max(math.sqrt(area / len(coords)), 1e-9)
+
+def _ring_cells(cx, cy, r, x0, x1, y0, y1):
+    """Các ô nằm trên chu vi vòng r quanh (cx, cy), đã cắt theo biên lưới."""
+    if r == 0:
+        if x0 <= cx <= x1 and y0 <= cy <= y1:
+            yield cx, cy
+        return
+    for gy in (cy - r, cy + r):
+        if y0 <= gy <= y1:
+            for gx in range(max(cx - r, x0), min(cx + r, x1) + 1):
+                yield gx, gy
+    for gx in (cx - r, cx + r):
+        if x0 <= gx <= x1:
+            for gy in range(max(cy - r + 1, y0), min(cy + r - 1, y1) + 1):
+                yield gx, gy
+
+def snap_to_nodes(data, coords, cell_size=None):
+    """
+    Tìm nút đồ thị gần nhất (Euclidean) cho từng điểm trong data,
+    dùng lưới ô vuông để không phải duyệt toàn bộ nút cho mỗi khách hàng.
+    """
+    if not coords:
+        return [None] * len(data)
+    if cell_size is None:
+        cell_size = default_cell_size(coords)
+    grid = {}
+    for node, (x, y) in coords.items():
+        grid.setdefault((math.floor(x / cell_size), math.floor(y / cell_size)), []).append(node)
+    x0, x1 = min(k[0] for k in grid), max(k[0] for k in grid)
+    y0, y1 = min(k[1] for k in grid), max(k[1] for k in grid)
+
+    snapped = []
+    for d in data:
+        cx, cy = math.floor(d['x'] / cell_size), math.floor(d['y'] / cell_size)
+        # Bỏ qua các vòng nằm hoàn toàn ngoài lưới, dừng khi đã quét hết lưới
+        r = max(0, x0 - cx, cx - x1, y0 - cy, cy - y1)
+        r_max = max(cx - x0, x1 - cx, cy - y0, y1 - cy)
+        best, best_d2 = None, float('inf')
+        while r <= r_max:
+            for cell in _ring_cells(cx, cy, r, x0, x1, y0, y1):
+                for node in grid.get(cell, ()):
+                    x, y = coords[node]
+                    d2 = (x - d['x'])**2 + (y - d['y'])**2
+                    if d2 < best_d2:
+                        best, best_d2 = node, d2
+            # Mọi nút ở vòng r + 1 trở đi cách điểm ít nhất r * cell_size
+            if best is not None and r * cell_size >= math.sqrt(best_d2):
+                break
+            r += 1
+        snapped.append(best)
+    return snapped
+
+
+# --- 3. TIỀN XỬ LÝ CONTRACTION HIERARCHIES ---
+def _witness_search(out_edges, source, avoid, limit, contracted, max_settled=60):
+    """Dijkstra giới hạn từ source, bỏ qua nút avoid và các nút đã co."""
+    dist = {source: 0.0}
+    heap = [(0.0, source)]
+    settled = 0
+    while heap and settled < max_settled:
+        d, u = heapq.heappop(heap)
+        if d > dist[u]:
+            continue
+        if d > limit:
+            break
+        settled += 1
+        for v, w in out_edges[u].items():
+            if v == avoid or v in contracted:
+                continue
+            nd = d + w
+            if nd < dist.get(v, float('inf')):
+                dist[v] = nd
+                heapq.heappush(heap, (nd, v))
+    return dist
+
+def _contract(v, out_edges, in_edges, contracted):
+    """Trả về danh sách shortcut cần thêm khi co nút v."""
+    shortcuts = []
+    ins = [(u, w) for u, w in in_edges[v].items() if u not in contracted and u != v]
+    outs = [(x, w) for x, w in out_edges[v].items() if x not in contracted and x != v]
+    if not outs:
+        return shortcuts
+    max_out = max(w for _, w in outs)
+    for u, w1 in ins:
+        dist = _witness_search(out_edges, u, v, w1 + max_out, contracted)
+        for x, w2 in outs:
+            if x != u and dist.get(x, float('inf')) > w1 + w2:
+                shortcuts.append((u, x, w1 + w2))
+    return shortcuts
+
+def build_contraction_hierarchy(adj):
+    """
+    Co lần lượt các nút theo độ ưu tiên (edge difference + số láng giềng đã co),
+    trả về (fwd, bwd): fwd[u] là các cạnh u -> x lên dốc, bwd[t] là các cạnh u -> t
+    với u xếp hạng cao hơn t (dùng cho tìm kiếm ngược).
+    """
+    out_edges = {u: {} for u in adj}
+    in_edges = {u: {} for u in adj}
+    for u, edges in adj.items():
+        for v, w in edges:
+            if u != v and w < out_edges[u].get(v, float('inf')):
+                out_edges[u][v] = w
+                in_edges[v][u] = w
+
+    contracted = set()
+    deleted_neighbors = {u: 0 for u in adj}
+
+    def priority(v):
+        shortcuts = _contract(v, out_edges, in_edges, contracted)
+        degree = sum(1 for u in in_edges[v] if u not in contracted) + sum(1 for x in out_edges[v] if x not in contracted)
+        return len(shortcuts) - degree + deleted_neighbors[v]
+
+    heap = [(priority(v), v) for v in adj]
+    heapq.heapify(heap)
+    rank = {}
+    while heap:
+        _, v = heapq.heappop(heap)
+        if v in contracted:
+            continue
+        # Cập nhật lười: nếu độ ưu tiên đã tăng thì đưa lại vào heap
+        p = priority(v)
+        if heap and p > heap[0][0]:
+            heapq.heappush(heap, (p, v))
+            continue
+        for u, x, w in _contract(v, out_edges, in_edges, contracted):
+            if w < out_edges[u].get(x, float('inf')):
+                out_edges[u][x] = w
+                in_edges[x][u] = w
+        contracted.add(v)
+        rank[v] = len(rank)
+        for n in set(in_edges[v]) | set(out_edges[v]):
+            deleted_neighbors[n] += 1
+
+    fwd = {u: [] for u in adj}
+    bwd = {u: [] for u in adj}
+    for u, edges in out_edges.items():
+        for x, w in edges.items():
+            if rank[x] > rank[u]:
+                fwd[u].append((x, w))
+            else:
+                bwd[x].append((u, w))
+    return fwd, bwd
+
+
+# --- 4. MANY-TO-MANY BẰNG BUCKET ---
+def _upward_search(graph, source):
+    dist = {source: 0.0}
+    heap = [(0.0, source)]
+    settled = []
+    while heap:
+        d, u = heapq.heappop(heap)
+        if d > dist[u]:
+            continue
+        settled.append((u, d))
+        for v, w in graph.get(u, ()):
+            nd = d + w
+            if nd < dist.get(v, float('inf')):
+                dist[v] = nd
+                heapq.heappush(heap, (nd, v))
+    return settled
+
+def _init_worker(fwd, buckets):
+    global _FWD, _BUCKETS
+    _FWD = fwd
+    _BUCKETS = buckets
+
+def _scan_buckets(source):
+    # row[k]: thời gian ngắn nhất từ source tới đích thứ k (inf nếu không tới được)
+    row = np.full(_BUCKETS[0], np.inf)
+    for u, d in _upward_search(_FWD, source):
+        bucket = _BUCKETS[1].get(u)
+        if bucket is not None:
+            idx, dt = bucket
+            row[idx] = np.minimum(row[idx], dt + d)
+    return row
+
+def many_to_many(fwd, bwd, sources, targets, workers=None):
+    """
+    Tìm kiếm ngược lên dốc từ mỗi đích ghi (đích, khoảng cách) vào bucket của
+    các nút gặp được; tìm kiếm xuôi lên dốc từ mỗi nguồn quét các bucket đó.
+    Các nguồn được chia cho nhiều tiến trình khi số lượng đủ lớn.
+    Trả về ma trận numpy M[i, j] theo thứ tự của sources và targets.
+    """
+    lists = {}
+    for k, t in enumerate(targets):
+        for v, d in _upward_search(bwd, t):
+            entry = lists.setdefault(v, ([], []))
+            entry[0].append(k)
+            entry[1].append(d)
+    buckets = (len(targets), {v: (np.array(idx, dtype=np.intp), np.array(dt))
+                              for v, (idx, dt) in lists.items()})
+
+    if workers == 1 or len(sources) < 256:
+        _init_worker(fwd, buckets)
+        rows = list(map(_scan_buckets, sources))
+    else:
+        workers = workers or os.cpu_count() or 1
+        chunk = max(1, len(sources) // (4 * workers))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(fwd, buckets)) as ex:
+            rows = list(ex.map(_scan_buckets, sources, chunksize=chunk))
+    return np.array(rows).reshape(len(sources), len(targets))
+
+
+# --- 5. BỘ NHỚ ĐỆM TRÊN ĐĨA ---
+def _graph_key(graph_path):
+    st = os.stat(graph_path)
+    return f"{os.path.abspath(graph_path)}|{st.st_size}|{st.st_mtime_ns}|"
+
+def _cache_key(graph_path, nodes):
+    h = hashlib.sha1()
+    h.update(_graph_key(graph_path).encode())
+    h.update(','.join(map(str, nodes)).encode())
+    return h.hexdigest()
+
+def load_contraction_hierarchy(graph_path, adj, cache_dir=None):
+    """Dựng CH cho đồ thị, đọc/ghi cache pickle theo file đồ thị nếu có cache_dir."""
+    ch_path = None
+    if cache_dir:
+        ch_path = os.path.join(cache_dir, hashlib.sha1(_graph_key(graph_path).encode()).hexdigest() + '.ch')
+        if os.path.exists(ch_path):
+            with open(ch_path, 'rb') as f:
+                return pickle.load(f)
+    fwd, bwd = build_contraction_hierarchy(adj)
+    if ch_path:
+        with open(ch_path, 'wb') as f:
+            pickle.dump((fwd, bwd), f, protocol=pickle.HIGHEST_PROTOCOL)
+    return fwd, bwd
+
+
+# --- 6. HÀM CHÍNH: XÂY MA TRẬN THAY CHO KHOẢNG CÁCH EUCLIDEAN ---
+def build_travel_time_matrix(data, graph_path, cache_dir='road_cache', workers=None, cell_size=None):
+    """
+    Trả về ma trận dist[i][j] (thời gian di chuyển trên mạng đường) cùng
+    kích thước và thứ tự với data, dùng được trực tiếp cho solve_vrptw_*.
+    cell_size là kích thước ô lưới khi gắn điểm vào nút (mặc định tự suy từ đồ thị).
+    """
+    coords, adj = read_road_graph(graph_path)
+    if coords is None:
+        print(f"Lỗi: Không tìm thấy file đồ thị {graph_path}")
+        return None
+    nodes = snap_to_nodes(data, coords, cell_size)
+    n = len(data)
+
+    cache_path = None
+    if cache_dir:
+        if not os.path.exists(cache_dir):
+            os.makedirs(cache_dir)
+        # Ma trận lưu dạng nhị phân (n*n số float64 liên tiếp theo hàng)
+        cache_path = os.path.join(cache_dir, _cache_key(graph_path, nodes) + '.bin')
+        if os.path.exists(cache_path):
+            return np.fromfile(cache_path, dtype=np.float64).reshape(n, n).tolist()
+
+    fwd, bwd = load_contraction_hierarchy(graph_path, adj, cache_dir)
+    # Nhiều khách hàng có thể gắn vào cùng một nút, chỉ tính mỗi nút một lần
+    unique = list(dict.fromkeys(nodes))
+    where = {v: k for k, v in enumerate(unique)}
+    pos = [where[v] for v in nodes]
+    times = many_to_many(fwd, bwd, unique, unique, workers=workers)
+    dist = times[np.ix_(pos, pos)]
+    np.fill_diagonal(dist, 0.0)
+    if np.isinf(dist).any():
+        i, j = np.argwhere(np.isinf(dist))[0]
+        raise ValueError(f"Không có đường đi từ điểm {data[i]['id']} tới điểm {data[j]['id']} trên đồ thị")
+
+    if cache_path:
+        dist.astype(np.float64).tofile(cache_path)
+    return dist.tolist()
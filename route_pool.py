@@ -0,0 +1,179 @@
+from mip import Model, xsum, BINARY, MINIMIZE, ConstrsGenerator, OptimizationStatus
+
+# --- KHO LỘ TRÌNH (ROUTE POOL) + BÀI TOÁN PHÂN HOẠCH TẬP (SET PARTITIONING) ---
+# Trong quá trình Branch and Cut, CBC đi qua rất nhiều nghiệm LP và lời giải nguyên;
+# mỗi lộ trình khả thi xuất phát từ depot dựng được từ chúng được lưu lại,
+# sau đó một MIP phân hoạch tập chọn tổ hợp lộ trình tốt nhất phủ đủ khách hàng.
+# Việc ghép lại chỉ chạy một lần ở cuối: mỗi lần gọi lại optimize() CBC dựng lại
+# cây tìm kiếm từ nút gốc, nên chia nhỏ thời gian giải để ghép định kỳ (kèm
+# model.start) cho kết quả kém hơn hẳn so với để CBC chạy liền một mạch.
+
+class RoutePool:
+    def __init__(self, data, capacity, dist):
+        self.data = data
+        self.capacity = capacity
+        self.dist = dist
+        # Khóa là tập khách hàng (frozenset), chỉ giữ thứ tự đi rẻ nhất
+        self.routes = {}
+
+    def route_cost(self, route):
+        return sum(self.dist[route[k]][route[k + 1]] for k in range(len(route) - 1))
+
+    def is_feasible(self, route):
+        """
+        Kiểm tra sức tải và khung thời gian theo đúng các ràng buộc của mô hình
+        (khách hàng phục vụ trong [ready, due], tổng demand <= capacity).
+        """
+        if len(route) < 3 or route[0] != 0 or route[-1] != 0:
+            return False
+        customers = route[1:-1]
+        if 0 in customers or len(set(customers)) != len(customers):
+            return False
+        if sum(self.data[i]['demand'] for i in customers) > self.capacity:
+            return False
+        t = self.data[0]['ready']
+        prev = 0
+        for i in customers:
+            t = max(t + self.data[prev]['service'] + self.dist[prev][i], self.data[i]['ready'])
+            if t > self.data[i]['due'] + 1e-6:
+                return False
+            prev = i
+        return True
+
+    def add(self, route):
+        if not self.is_feasible(route):
+            return False
+        key = frozenset(route[1:-1])
+        cost = self.route_cost(route)
+        old = self.routes.get(key)
+        if old is not None and old[1] <= cost + 1e-9:
+            return False
+        self.routes[key] = (list(route), cost)
+        return True
+
+    def add_with_variants(self, route):
+        """
+        Lưu route cùng các biến thể bỏ bớt một khách hàng, để bài toán phân hoạch
+        có thể ghép các lộ trình lấy từ những lời giải khác nhau mà không bị trùng khách.
+        """
+        if not self.add(route) and frozenset(route[1:-1]) not in self.routes:
+            return
+        if len(route) > 3:
+            for k in range(1, len(route) - 1):
+                self.add(route[:k] + route[k + 1:])
+
+    def add_from_successors(self, succ):
+        """
+        Nhận danh sách kề succ[i] = [j, ...] của một lời giải nguyên
+        và lưu lại mọi lộ trình đi ra từ depot và quay về depot.
+        """
+        n = len(succ)
+        for j in succ[0]:
+            route = [0, j]
+            curr = j
+            while curr != 0 and len(route) <= n and succ[curr]:
+                curr = succ[curr][0]
+                route.append(curr)
+            if curr == 0:
+                self.add_with_variants(route)
+
+    def add_model_solutions(self, model, x):
+        """Duyệt toàn bộ lời giải CBC còn giữ trong solution pool của model."""
+        n = len(x)
+        for k in range(model.num_solutions):
+            succ = [[] for _ in range(n)]
+            for i in range(n):
+                for j in range(n):
+                    if i != j:
+                        val = x[i][j].xi(k)
+                        if val is not None and val >= 0.99:
+                            succ[i].append(j)
+            self.add_from_successors(succ)
+
+    def seed_single_customer_routes(self):
+        # Lộ trình 0 -> i -> 0 giúp phủ các khách hàng chưa nằm trong lộ trình nào
+        for i in range(1, len(self.data)):
+            self.add([0, i, 0])
+
+    def recombine(self, max_vehicles=25, max_seconds=60):
+        """
+        Giải bài toán phân hoạch tập trên kho lộ trình bằng CBC.
+        Trả về (routes, total_dist) hoặc (None, None) nếu không tìm được lời giải.
+        """
+        pool = list(self.routes.values())
+        if not pool:
+            return None, None
+        model = Model(sense=MINIMIZE, solver_name="CBC")
+        model.verbose = 0
+        y = [model.add_var(var_type=BINARY) for _ in pool]
+
+        model.objective = xsum(cost * y[r] for r, (_, cost) in enumerate(pool))
+
+        covering = [[] for _ in range(len(self.data))]
+        for r, (route, _) in enumerate(pool):
+            for i in route[1:-1]:
+                covering[i].append(r)
+        for i in range(1, len(self.data)):
+            if not covering[i]:
+                return None, None
+            model.add_constr(xsum(y[r] for r in covering[i]) == 1)
+        model.add_constr(xsum(y) <= max_vehicles)
+
+        status = model.optimize(max_seconds=max_seconds)
+        if status != OptimizationStatus.OPTIMAL and status != OptimizationStatus.FEASIBLE:
+            return None, None
+
+        routes = [pool[r][0] for r in range(len(pool)) if y[r].x is not None and y[r].x >= 0.99]
+        return routes, sum(self.route_cost(route) for route in routes)
+
+
+class RouteHarvester(ConstrsGenerator):
+    """
+    Bộ sinh nhát cắt không thêm ràng buộc nào: ở mỗi lần CBC gọi (nghiệm LP tại
+    các nút của cây), dựng lộ trình bằng cách đi theo cung có giá trị lớn nhất
+    từ depot và đưa các lộ trình khả thi vào kho.
+    """
+    def __init__(self, x, pool):
+        self.x = x
+        self.pool = pool
+
+    def generate_constrs(self, model, depth=0, npass=0):
+        xt = model.translate(self.x)
+        n = len(xt)
+        val = [[v.x if v is not None and v.x is not None else 0.0 for v in row] for row in xt]
+        for j in range(1, n):
+            if val[0][j] < 0.1:
+                continue
+            route = [0, j]
+            visited = {j}
+            curr = j
+            while True:
+                nxt = max((k for k in range(1, n) if k not in visited), key=lambda k: val[curr][k], default=0)
+                if nxt == 0 or val[curr][nxt] < max(val[curr][0], 0.1):
+                    break
+                route.append(nxt)
+                visited.add(nxt)
+                curr = nxt
+            route.append(0)
+            self.pool.add_with_variants(route)
+
+
+def optimize_with_route_pool(model, x, pool, max_seconds=None, max_vehicles=25):
+    """
+    Giải model trong max_seconds giây (RouteHarvester thu lộ trình từ nghiệm LP
+    trong lúc giải), đưa lời giải CBC còn giữ vào kho rồi giải bài toán phân hoạch
+    tập một lần ở cuối.
+    Trả về (status, routes, total_dist) với routes là lời giải ghép được.
+    """
+    model.cuts_generator = RouteHarvester(x, pool)
+    if max_seconds is not None:
+        status = model.optimize(max_seconds=max_seconds)
+    else:
+        status = model.optimize()
+    if status == OptimizationStatus.OPTIMAL or status == OptimizationStatus.FEASIBLE:
+        pool.add_model_solutions(model, x)
+    pool.seed_single_customer_routes()
+    sp_routes, sp_dist = pool.recombine(max_vehicles=max_vehicles)
+    if sp_routes:
+        print(f"[ROUTE POOL] {len(pool.routes)} lộ trình, ghép lại được: {sp_dist:.2f}")
+    return status, sp_routes, sp_dist
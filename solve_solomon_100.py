@@ -3,6 +3,7 @@ import os
 import time
 import matplotlib.pyplot as plt
 from mip import Model, xsum, BINARY, MINIMIZE, ConstrsGenerator, OptimizationStatus
+from route_pool import RoutePool, optimize_with_route_pool
 
 # --- 1. LỚP TẠO NHÁT CẮT (LAZY CONSTRAINTS) ---
 class SubtourElimination(ConstrsGenerator):
@@ -53,12 +54,18 @@ def read_solomon_100(file_path, n_customers=100):
     return data, capacity
 
 # --- 3. THUẬT TOÁN BRANCH AND CUT (OPTIMIZED) ---
-def solve_vrptw_100(data, capacity):
+def build_dist_matrix(data):
+    # Tính ma trận khoảng cách Euclidean
+    n = len(data)
+    return [[math.sqrt((data[i]['x']-data[j]['x'])**2 + (data[i]['y']-data[j]['y'])**2) for j in range(n)] for i in range(n)]
+
+def build_model_100(data, capacity, dist=None):
     n = len(data)
     model = Model(solver_name="CBC")
     
-    # Tính ma trận khoảng cách Euclidean
-    dist = [[math.sqrt((data[i]['x']-data[j]['x'])**2 + (data[i]['y']-data[j]['y'])**2) for j in range(n)] for i in range(n)]
+    # (có thể truyền vào ma trận thời gian từ road_network.build_travel_time_matrix)
+    if dist is None:
+        dist = build_dist_matrix(data)
 
     # Biến quyết định
     x = [[model.add_var(var_type=BINARY, name=f"x_{i}_{j}") for j in range(n)] for i in range(n)]
@@ -90,9 +97,23 @@ def solve_vrptw_100(data, capacity):
         model.add_constr(u[i] >= data[i]['demand'])
         model.add_constr(u[i] <= capacity)
 
+    return model, x, dist
+
+def solve_vrptw_100(data, capacity, dist=None, use_route_pool=False, max_seconds=None):
+    n = len(data)
+    model, x, dist = build_model_100(data, capacity, dist)
+
     # Kích hoạt tạo nhát cắt tự động (Lazy Constraints)
+    pool = RoutePool(data, capacity, dist) if use_route_pool else None
     model.constrs_generator = SubtourElimination(n)
-    status = model.optimize()
+    sp_routes, sp_dist = None, None
+    if pool is not None:
+        # Giải trong giới hạn thời gian rồi ghép lại kho lộ trình
+        status, sp_routes, sp_dist = optimize_with_route_pool(model, x, pool, max_seconds)
+    elif max_seconds is not None:
+        status = model.optimize(max_seconds=max_seconds)
+    else:
+        status = model.optimize()
 
     if status == OptimizationStatus.OPTIMAL or status == OptimizationStatus.FEASIBLE:
         total_dist = model.objective_value
@@ -111,7 +132,17 @@ def solve_vrptw_100(data, capacity):
                             break
                 routes.append(route)
                 print(f"Xe {len(routes)}: {' -> '.join(map(str, route))}")
+
+        # Lời giải ghép từ kho lộ trình tốt hơn lời giải của Branch and Cut
+        if sp_routes and sp_dist < total_dist - 1e-6:
+            print(f"[ROUTE POOL] TỔNG QUÃNG ĐƯỜNG MỚI: {sp_dist:.2f}")
+            routes, total_dist = sp_routes, sp_dist
+            for k, route in enumerate(routes):
+                print(f"Xe {k+1}: {' -> '.join(map(str, route))}")
         return routes, total_dist
+    elif sp_routes:
+        print(f"[ROUTE POOL] TỔNG QUÃNG ĐƯỜNG: {sp_dist:.2f}")
+        return sp_routes, sp_dist
     return None, None
 
 # --- 4. HÀM GHI FILE KẾT QUẢ ---
@@ -2,6 +2,7 @@ import math
 import os
 import matplotlib.pyplot as plt
 from mip import Model, xsum, BINARY, MINIMIZE, ConstrsGenerator, OptimizationStatus
+from route_pool import RoutePool, optimize_with_route_pool
 
 class SubtourElimination(ConstrsGenerator):
     def __init__(self, n):
@@ -46,13 +47,15 @@ def read_solomon(file_path, n_customers=25):
         })
     return data, capacity
 
-def solve_vrptw_branch_and_cut(data, capacity):
+def solve_vrptw_branch_and_cut(data, capacity, dist=None, use_route_pool=False, max_seconds=None):
     n = len(data)
     # DÒNG QUAN TRỌNG: Khởi tạo mô hình
     model = Model(solver_name="CBC") 
     
     # Tính ma trận khoảng cách
-    dist = [[math.sqrt((data[i]['x']-data[j]['x'])**2 + (data[i]['y']-data[j]['y'])**2) for j in range(n)] for i in range(n)]
+    # (có thể truyền vào ma trận thời gian từ road_network.build_travel_time_matrix)
+    if dist is None:
+        dist = [[math.sqrt((data[i]['x']-data[j]['x'])**2 + (data[i]['y']-data[j]['y'])**2) for j in range(n)] for i in range(n)]
 
     # 1. Biến quyết định
     x = [[model.add_var(var_type=BINARY, name=f"x_{i}_{j}") for j in range(n)] for i in range(n)]
@@ -86,8 +89,16 @@ def solve_vrptw_branch_and_cut(data, capacity):
         model.add_constr(u[i] <= capacity)
 
     # 5. Kích hoạt Lazy Constraints
+    pool = RoutePool(data, capacity, dist) if use_route_pool else None
     model.constrs_generator = SubtourElimination(n)
-    status = model.optimize()
+    sp_routes, sp_dist = None, None
+    if pool is not None:
+        # Giải trong giới hạn thời gian rồi ghép lại kho lộ trình
+        status, sp_routes, sp_dist = optimize_with_route_pool(model, x, pool, max_seconds)
+    elif max_seconds is not None:
+        status = model.optimize(max_seconds=max_seconds)
+    else:
+        status = model.optimize()
 
     # --- HẬU XỬ LÝ KẾT QUẢ ---
     if status == OptimizationStatus.OPTIMAL or status == OptimizationStatus.FEASIBLE:
@@ -110,8 +121,18 @@ def solve_vrptw_branch_and_cut(data, capacity):
                             break
                 routes.append(route)
                 print(f"Xe {len(routes)}: {' -> '.join(map(str, route))}")
+
+        # Lời giải ghép từ kho lộ trình tốt hơn lời giải của Branch and Cut
+        if sp_routes and sp_dist < total_dist - 1e-6:
+            print(f"[ROUTE POOL] TỔNG QUÃNG ĐƯỜNG MỚI: {sp_dist:.2f}")
+            routes, total_dist = sp_routes, sp_dist
+            for k, route in enumerate(routes):
+                print(f"Xe {k+1}: {' -> '.join(map(str, route))}")
         
         return routes, total_dist
+    elif sp_routes:
+        print(f"[ROUTE POOL] TỔNG QUÃNG ĐƯỜNG: {sp_dist:.2f}")
+        return sp_routes, sp_dist
     else:
         print("Không tìm thấy lời giải trong thời gian quy định.")
         return None, None